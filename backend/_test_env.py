@@ -0,0 +1,52 @@
+# backend/_test_env.py
+"""
+Shared environment check for the standalone generator test scripts.
+The check runs once per process; later calls return the cached result.
+"""
+import functools
+import importlib
+import os
+from pathlib import Path
+
+
+@functools.lru_cache(maxsize=None)
+def check_environment(module: str, success_message: str, missing_hint: str) -> bool:
+    """Check that environment is properly configured and that `module` imports
+
+    The result is cached per argument set, so the check output is only printed
+    on the first call.
+    """
+    print("\n🔧 Environment Check")
+    print("-" * 30)
+
+    # Check for API key
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        print("❌ GEMINI_API_KEY not found in environment")
+        print("💡 Please create a .env file with:")
+        print("   GEMINI_API_KEY=your-api-key-here")
+        return False
+
+    print(f"✅ GEMINI_API_KEY found: {api_key[:8]}...")
+
+    # Check Python path
+    current_dir = Path(__file__).parent
+    app_dir = current_dir / "app"
+
+    if not app_dir.exists():
+        print(f"❌ App directory not found: {app_dir}")
+        print("💡 Make sure you're running from the correct directory")
+        return False
+
+    print(f"✅ App directory found: {app_dir}")
+
+    # Test imports
+    try:
+        importlib.import_module(module)
+        print(f"✅ {success_message}")
+    except ImportError as e:
+        print(f"❌ Import failed: {e}")
+        print(f"💡 {missing_hint}")
+        return False
+
+    return True
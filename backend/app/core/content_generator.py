@@ -47,21 +47,29 @@ class ContentGenerationService:
             cosmos_service=self.cosmos_service,
             blob_service=self.blob_service
         )
+        
+        # Remaining generators share the master context generator's Gemini client
+        # so all components of a package reuse one connection pool
+        shared_client = self.master_context_generator.client
         self.reading_generator = ReadingContentGenerator(
             cosmos_service=self.cosmos_service,
-            blob_service=self.blob_service
+            blob_service=self.blob_service,
+            client=shared_client
         )
         self.visual_generator = VisualDemoGenerator(
             cosmos_service=self.cosmos_service,
-            blob_service=self.blob_service
+            blob_service=self.blob_service,
+            client=shared_client
         )
         self.audio_generator = AudioContentGenerator(
             cosmos_service=self.cosmos_service,
-            blob_service=self.blob_service
+            blob_service=self.blob_service,
+            client=shared_client
         )
         self.practice_generator = PracticeProblemsGenerator(
             cosmos_service=self.cosmos_service,
-            blob_service=self.blob_service
+            blob_service=self.blob_service,
+            client=shared_client
         )
         
         logger.info(f"ContentGenerationService initialized with all generators (Environment: {settings.ENVIRONMENT})")
@@ -15,15 +15,19 @@ logger = logging.getLogger(__name__)
 class BaseContentGenerator(ABC):
     """Base class for all content generators with shared functionality"""
     
-    def __init__(self, cosmos_service=None, blob_service=None):
-        self.client = None
+    def __init__(self, cosmos_service=None, blob_service=None, client=None):
+        self.client = client
         self.types = types
         self.cosmos_service = cosmos_service
         self.blob_service = blob_service
         self._initialize_gemini()
     
     def _initialize_gemini(self):
-        """Initialize Gemini client with configuration"""
+        """Initialize Gemini client with configuration, reusing a shared client if one was provided"""
+        if self.client is not None:
+            logger.info(f"Using shared Gemini client for {self.__class__.__name__}")
+            return
+        
         if not settings.GEMINI_API_KEY:
             raise ValueError(f"GEMINI_API_KEY is required. Please check your configuration in {settings.ENVIRONMENT} mode.")
         
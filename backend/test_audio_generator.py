@@ -19,6 +19,8 @@ load_dotenv()
 # Add the app directory to Python path
 sys.path.append(str(Path(__file__).parent / "app"))
 
+from _test_env import check_environment
+
 # Import the audio generator
 from app.core.generators.audio_content import AudioContentGenerator
 
@@ -382,7 +384,11 @@ async def run_audio_generator_tests():
     print("=" * 45)
     
     # Check environment first
-    if not check_environment():
+    if not check_environment(
+        "app.core.generators.audio_content",
+        "AudioContentGenerator import successful",
+        "Make sure audio_content.py is in place"
+    ):
         print("❌ Environment check failed - stopping tests")
         return
     
@@ -429,43 +435,6 @@ async def run_audio_generator_tests():
         print("🔧 Check dependencies and API configuration")
         raise
 
-def check_environment():
-    """Check that environment is properly configured"""
-    print("\n🔧 Environment Check")
-    print("-" * 30)
-    
-    # Check for API key
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        print("❌ GEMINI_API_KEY not found in environment")
-        print("💡 Please create a .env file with:")
-        print("   GEMINI_API_KEY=your-api-key-here")
-        return False
-    
-    print(f"✅ GEMINI_API_KEY found: {api_key[:8]}...")
-    
-    # Check Python path
-    current_dir = Path(__file__).parent
-    app_dir = current_dir / "app"
-    
-    if not app_dir.exists():
-        print(f"❌ App directory not found: {app_dir}")
-        print("💡 Make sure you're running from the correct directory")
-        return False
-    
-    print(f"✅ App directory found: {app_dir}")
-    
-    # Test imports
-    try:
-        from app.core.generators.audio_content import AudioContentGenerator
-        print("✅ AudioContentGenerator import successful")
-    except ImportError as e:
-        print(f"❌ Import failed: {e}")
-        print("💡 Make sure audio_content.py is in place")
-        return False
-    
-    return True
-
 if __name__ == "__main__":
     # Run the audio tests
     asyncio.run(run_audio_generator_tests())
\ No newline at end of file
@@ -317,7 +317,7 @@ async def test_api_endpoints():
 def print_review_api_examples():
     """Print example usage for review workflow"""
     
-    print("\n" + "📖 REVIEW WORKFLOW API EXAMPLES" + "\n" + "=" * 60)
+    print("", "📖 REVIEW WORKFLOW API EXAMPLES", "=" * 60, sep="\n")
     
     print("1️⃣ Get Packages for Review:")
     print("""
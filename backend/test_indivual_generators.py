@@ -4,7 +4,6 @@ Test script for individual generators to verify modularization works correctly.
 Run this BEFORE testing the full pipeline.
 """
 import asyncio
-import os
 import sys
 import pytest
 from pathlib import Path
@@ -17,14 +16,7 @@ load_dotenv()
 # Add the app directory to Python path
 sys.path.append(str(Path(__file__).parent / "app"))
 
-# Import the new generators
-from app.core.generators import (
-    MasterContextGenerator,
-    ReadingContentGenerator,
-    VisualDemoGenerator,
-    AudioContentGenerator,
-    PracticeProblemsGenerator
-)
+from _test_env import check_environment
 
 # Import models
 from app.models.content import (
@@ -98,192 +90,240 @@ def create_test_master_context() -> MasterContext:
 class TestIndividualGenerators:
     """Test each generator independently"""
     
-    def setup_method(self):
-        """Setup test data and mock services"""
-        self.mock_cosmos = MockCosmosService()
-        self.mock_blob = MockBlobService()
-        self.test_request = create_test_request()
-        self.test_context = create_test_master_context()
-        self.package_id = "test_pkg_123"
+    @classmethod
+    def setup_class(cls):
+        """Setup test data and mock services shared by all tests"""
+        cls.mock_cosmos = MockCosmosService()
+        cls.mock_blob = MockBlobService()
+        cls.test_request = create_test_request()
+        cls.test_context = create_test_master_context()
+        cls.package_id = "test_pkg_123"
+        cls.share_client = False
+        cls.genai_client = None
+
+    def _create_generator(self, generator_class):
+        """Create a generator with mock services, sharing one Gemini client when enabled"""
+        generator = generator_class(
+            cosmos_service=self.mock_cosmos,
+            blob_service=self.mock_blob,
+            client=self.genai_client
+        )
+        
+        # The first generator creates the client; later ones reuse it
+        if self.share_client:
+            self.genai_client = generator.client
+        
+        return generator
+
+    async def _call_master_context_api(self):
+        """Generate a master context (API-bound part of the master context test)"""
+        from app.core.generators import MasterContextGenerator
+        generator = self._create_generator(MasterContextGenerator)
+        
+        return await generator.generate_master_context(self.test_request)
+
+    def _assert_master_context_shape(self, context):
+        """Verify the generated master context structure"""
+        assert isinstance(context, MasterContext)
+        assert len(context.core_concepts) >= 3
+        assert len(context.key_terminology) >= 3
+        assert len(context.learning_objectives) >= 3
+        assert context.difficulty_level is not None
+        assert len(context.real_world_applications) >= 3
+        
+        print("✅ Master context generated successfully")
+        print(f"   - Core concepts: {len(context.core_concepts)}")
+        print(f"   - Key terms: {len(context.key_terminology)}")
+        print(f"   - Learning objectives: {len(context.learning_objectives)}")
 
     @pytest.mark.asyncio
     async def test_master_context_generator(self):
         """Test MasterContextGenerator works independently"""
         print("\n🧪 Testing MasterContextGenerator...")
         
-        generator = MasterContextGenerator(
-            cosmos_service=self.mock_cosmos,
-            blob_service=self.mock_blob
-        )
-        
-        # Test context generation
         try:
-            context = await generator.generate_master_context(self.test_request)
-            
-            # Verify structure
-            assert isinstance(context, MasterContext)
-            assert len(context.core_concepts) >= 3
-            assert len(context.key_terminology) >= 3
-            assert len(context.learning_objectives) >= 3
-            assert context.difficulty_level is not None
-            assert len(context.real_world_applications) >= 3
-            
-            print("✅ Master context generated successfully")
-            print(f"   - Core concepts: {len(context.core_concepts)}")
-            print(f"   - Key terms: {len(context.key_terminology)}")
-            print(f"   - Learning objectives: {len(context.learning_objectives)}")
+            context = await self._call_master_context_api()
+            self._assert_master_context_shape(context)
             
         except Exception as e:
             print(f"❌ Master context generation failed: {e}")
             raise
 
+    async def _call_reading_content_api(self):
+        """Generate and revise reading content (API-bound part of the reading test)"""
+        from app.core.generators import ReadingContentGenerator
+        generator = self._create_generator(ReadingContentGenerator)
+        
+        reading_comp = await generator.generate_reading_content(
+            self.test_request, self.test_context, self.package_id
+        )
+        
+        # Don't revise content that is already malformed
+        assert "title" in reading_comp.content
+        assert "sections" in reading_comp.content
+        
+        # Test revision functionality
+        revised_content = await generator.revise_reading_content(
+            reading_comp.content,
+            "Make it more engaging for younger students",
+            self.test_context
+        )
+        
+        return reading_comp, revised_content
+
+    def _assert_reading_content_shape(self, result):
+        """Verify the generated and revised reading content structure"""
+        reading_comp, revised_content = result
+        
+        assert isinstance(reading_comp, ContentComponent)
+        assert reading_comp.component_type == ComponentType.READING
+        assert reading_comp.package_id == self.package_id
+        assert "title" in reading_comp.content
+        assert "sections" in reading_comp.content
+        assert len(reading_comp.content["sections"]) > 0
+        
+        print("✅ Reading content generated successfully")
+        print(f"   - Sections: {len(reading_comp.content['sections'])}")
+        print(f"   - Word count: {reading_comp.content.get('word_count', 'N/A')}")
+        
+        assert "title" in revised_content
+        assert "sections" in revised_content
+        print("✅ Reading content revision successful")
+
     @pytest.mark.asyncio 
     async def test_reading_content_generator(self):
         """Test ReadingContentGenerator works independently"""
         print("\n🧪 Testing ReadingContentGenerator...")
         
-        generator = ReadingContentGenerator(
-            cosmos_service=self.mock_cosmos,
-            blob_service=self.mock_blob
-        )
-        
         try:
-            # Test reading content generation
-            reading_comp = await generator.generate_reading_content(
-                self.test_request, self.test_context, self.package_id
-            )
-            
-            # Verify structure
-            assert isinstance(reading_comp, ContentComponent)
-            assert reading_comp.component_type == ComponentType.READING
-            assert reading_comp.package_id == self.package_id
-            assert "title" in reading_comp.content
-            assert "sections" in reading_comp.content
-            assert len(reading_comp.content["sections"]) > 0
-            
-            print("✅ Reading content generated successfully")
-            print(f"   - Sections: {len(reading_comp.content['sections'])}")
-            print(f"   - Word count: {reading_comp.content.get('word_count', 'N/A')}")
-            
-            # Test revision functionality
-            revised_content = await generator.revise_reading_content(
-                reading_comp.content,
-                "Make it more engaging for younger students",
-                self.test_context
-            )
-            
-            assert "title" in revised_content
-            assert "sections" in revised_content
-            print("✅ Reading content revision successful")
+            result = await self._call_reading_content_api()
+            self._assert_reading_content_shape(result)
             
         except Exception as e:
             print(f"❌ Reading content generation failed: {e}")
             raise
 
+    async def _call_visual_demo_api(self):
+        """Generate p5.js code, metadata and a full demo (API-bound part of the visual test)"""
+        from app.core.generators import VisualDemoGenerator
+        generator = self._create_generator(VisualDemoGenerator)
+        
+        p5_code = await generator.generate_p5js_code(self.test_request, self.test_context)
+        
+        # Don't request metadata or a full demo if the code is already unusable
+        assert isinstance(p5_code, str)
+        assert len(p5_code) > 100
+        assert "function setup()" in p5_code or "setup()" in p5_code
+        
+        metadata = await generator.generate_visual_metadata(
+            p5_code, self.test_request, self.test_context
+        )
+        visual_comp = await generator.generate_visual_demo(
+            self.test_request, self.test_context, self.package_id
+        )
+        
+        return p5_code, metadata, visual_comp
+
+    def _assert_visual_demo_shape(self, result):
+        """Verify the generated p5.js code, metadata and visual demo structure"""
+        p5_code, metadata, visual_comp = result
+        
+        assert isinstance(p5_code, str)
+        assert len(p5_code) > 100
+        assert "function setup()" in p5_code or "setup()" in p5_code
+        assert "function draw()" in p5_code or "draw()" in p5_code
+        
+        print("✅ P5.js code generated successfully")
+        print(f"   - Code length: {len(p5_code)} characters")
+        # Count outside the f-string to avoid a backslash in the expression
+        line_count = p5_code.count('\n') + 1
+        print(f"   - Lines: {line_count}")
+        
+        assert "description" in metadata
+        assert "interactive_elements" in metadata
+        assert "concepts_demonstrated" in metadata
+        assert len(metadata["interactive_elements"]) > 0
+        
+        print("✅ Visual metadata generated successfully")
+        print(f"   - Interactive elements: {len(metadata['interactive_elements'])}")
+        
+        assert isinstance(visual_comp, ContentComponent)
+        assert visual_comp.component_type == ComponentType.VISUAL
+        assert "p5_code" in visual_comp.content
+        assert "description" in visual_comp.content
+        
+        print("✅ Complete visual demo generated successfully")
+
     @pytest.mark.asyncio
     async def test_visual_demo_generator(self):
         """Test VisualDemoGenerator works independently"""
         print("\n🧪 Testing VisualDemoGenerator...")
         
-        generator = VisualDemoGenerator(
-            cosmos_service=self.mock_cosmos,
-            blob_service=self.mock_blob
-        )
-        
         try:
-            # Test p5.js code generation
-            p5_code = await generator.generate_p5js_code(self.test_request, self.test_context)
-            
-            assert isinstance(p5_code, str)
-            assert len(p5_code) > 100
-            assert "function setup()" in p5_code or "setup()" in p5_code
-            assert "function draw()" in p5_code or "draw()" in p5_code
-            
-            print("✅ P5.js code generated successfully")
-            print(f"   - Code length: {len(p5_code)} characters")
-            # Fix: Store the split result in a variable to avoid backslash in f-string
-            code_lines = p5_code.split('\n')
-            print(f"   - Lines: {len(code_lines)}")
-            
-            # Test metadata generation
-            metadata = await generator.generate_visual_metadata(
-                p5_code, self.test_request, self.test_context
-            )
-            
-            assert "description" in metadata
-            assert "interactive_elements" in metadata
-            assert "concepts_demonstrated" in metadata
-            assert len(metadata["interactive_elements"]) > 0
-            
-            print("✅ Visual metadata generated successfully")
-            print(f"   - Interactive elements: {len(metadata['interactive_elements'])}")
-            
-            # Test complete demo generation
-            visual_comp = await generator.generate_visual_demo(
-                self.test_request, self.test_context, self.package_id
-            )
-            
-            assert isinstance(visual_comp, ContentComponent)
-            assert visual_comp.component_type == ComponentType.VISUAL
-            assert "p5_code" in visual_comp.content
-            assert "description" in visual_comp.content
-            
-            print("✅ Complete visual demo generated successfully")
+            result = await self._call_visual_demo_api()
+            self._assert_visual_demo_shape(result)
             
         except Exception as e:
             print(f"❌ Visual demo generation failed: {e}")
             raise
 
+    async def _call_audio_content_api(self):
+        """Generate a script and audio component (API-bound part of the audio test)"""
+        from app.core.generators import AudioContentGenerator
+        generator = self._create_generator(AudioContentGenerator)
+        
+        script = await generator.generate_audio_script(self.test_request, self.test_context)
+        
+        # Don't synthesize audio from an unusable script
+        assert isinstance(script, str)
+        assert len(script) > 50
+        
+        # Audio generation honours the TTS toggle
+        audio_comp = await generator.generate_and_store_audio(script, self.package_id)
+        
+        return script, audio_comp
+
+    def _assert_audio_content_shape(self, result):
+        """Verify the generated audio script and component structure"""
+        script, audio_comp = result
+        
+        assert isinstance(script, str)
+        assert len(script) > 50
+        assert "Teacher:" in script
+        assert "Student:" in script
+        
+        print("✅ Audio script generated successfully")
+        print(f"   - Script length: {len(script)} characters")
+        word_count = len(script.split())
+        print(f"   - Word count: {word_count}")
+        
+        assert isinstance(audio_comp, ContentComponent)
+        assert audio_comp.component_type == ComponentType.AUDIO
+        assert "dialogue_script" in audio_comp.content
+        assert "duration_seconds" in audio_comp.content
+        assert "tts_status" in audio_comp.content
+        
+        print("✅ Audio component generated successfully")
+        print(f"   - TTS status: {audio_comp.content['tts_status']}")
+        print(f"   - Duration: {audio_comp.content['duration_seconds']:.1f} seconds")
+
     @pytest.mark.asyncio
     async def test_audio_content_generator(self):
         """Test AudioContentGenerator works independently"""
         print("\n🧪 Testing AudioContentGenerator...")
         
-        generator = AudioContentGenerator(
-            cosmos_service=self.mock_cosmos,
-            blob_service=self.mock_blob
-        )
-        
         try:
-            # Test script generation
-            script = await generator.generate_audio_script(self.test_request, self.test_context)
-            
-            assert isinstance(script, str)
-            assert len(script) > 50
-            assert "Teacher:" in script
-            assert "Student:" in script
-            
-            print("✅ Audio script generated successfully")
-            print(f"   - Script length: {len(script)} characters")
-            word_count = len(script.split())
-            print(f"   - Word count: {word_count}")
-            
-            # Test audio generation (will use TTS toggle)
-            audio_comp = await generator.generate_and_store_audio(script, self.package_id)
-            
-            assert isinstance(audio_comp, ContentComponent)
-            assert audio_comp.component_type == ComponentType.AUDIO
-            assert "dialogue_script" in audio_comp.content
-            assert "duration_seconds" in audio_comp.content
-            assert "tts_status" in audio_comp.content
-            
-            print("✅ Audio component generated successfully")
-            print(f"   - TTS status: {audio_comp.content['tts_status']}")
-            print(f"   - Duration: {audio_comp.content['duration_seconds']:.1f} seconds")
+            result = await self._call_audio_content_api()
+            self._assert_audio_content_shape(result)
             
         except Exception as e:
             print(f"❌ Audio content generation failed: {e}")
             raise
 
-    @pytest.mark.asyncio
-    async def test_practice_problems_generator(self):
-        """Test PracticeProblemsGenerator works independently"""
-        print("\n🧪 Testing PracticeProblemsGenerator...")
-        
-        generator = PracticeProblemsGenerator(
-            cosmos_service=self.mock_cosmos,
-            blob_service=self.mock_blob
-        )
+    async def _call_practice_problems_api(self):
+        """Generate practice problems from mock components (API-bound part of the practice test)"""
+        from app.core.generators import PracticeProblemsGenerator
+        generator = self._create_generator(PracticeProblemsGenerator)
         
         # Create mock reading and visual components
         mock_reading = ContentComponent(
@@ -309,28 +349,37 @@ class TestIndividualGenerators:
             metadata={}
         )
         
+        return await generator.generate_practice_problems(
+            self.test_request, self.test_context, mock_reading, mock_visual, self.package_id
+        )
+
+    def _assert_practice_problems_shape(self, practice_comp):
+        """Verify the generated practice problems structure"""
+        assert isinstance(practice_comp, ContentComponent)
+        assert practice_comp.component_type == ComponentType.PRACTICE
+        assert "problems" in practice_comp.content
+        assert "problem_count" in practice_comp.content
+        assert len(practice_comp.content["problems"]) >= 5
+        
+        # Verify problem structure
+        first_problem = practice_comp.content["problems"][0]
+        assert "problem_data" in first_problem
+        assert "problem_type" in first_problem["problem_data"]
+        assert "problem" in first_problem["problem_data"]
+        assert "answer" in first_problem["problem_data"]
+        
+        print("✅ Practice problems generated successfully")
+        print(f"   - Problem count: {practice_comp.content['problem_count']}")
+        print(f"   - Estimated time: {practice_comp.content['estimated_time_minutes']} minutes")
+
+    @pytest.mark.asyncio
+    async def test_practice_problems_generator(self):
+        """Test PracticeProblemsGenerator works independently"""
+        print("\n🧪 Testing PracticeProblemsGenerator...")
+        
         try:
-            # Test practice problems generation
-            practice_comp = await generator.generate_practice_problems(
-                self.test_request, self.test_context, mock_reading, mock_visual, self.package_id
-            )
-            
-            assert isinstance(practice_comp, ContentComponent)
-            assert practice_comp.component_type == ComponentType.PRACTICE
-            assert "problems" in practice_comp.content
-            assert "problem_count" in practice_comp.content
-            assert len(practice_comp.content["problems"]) >= 5
-            
-            # Verify problem structure
-            first_problem = practice_comp.content["problems"][0]
-            assert "problem_data" in first_problem
-            assert "problem_type" in first_problem["problem_data"]
-            assert "problem" in first_problem["problem_data"]
-            assert "answer" in first_problem["problem_data"]
-            
-            print("✅ Practice problems generated successfully")
-            print(f"   - Problem count: {practice_comp.content['problem_count']}")
-            print(f"   - Estimated time: {practice_comp.content['estimated_time_minutes']} minutes")
+            practice_comp = await self._call_practice_problems_api()
+            self._assert_practice_problems_shape(practice_comp)
             
         except Exception as e:
             print(f"❌ Practice problems generation failed: {e}")
@@ -342,68 +391,59 @@ async def run_individual_generator_tests():
     print("=" * 50)
     
     # Check environment first
-    if not check_environment():
+    if not check_environment(
+        "app.core.generators",
+        "Generator imports successful",
+        "Make sure all generator files are in place"
+    ):
         print("❌ Environment check failed - stopping tests")
         return
     
     test_suite = TestIndividualGenerators()
-    test_suite.setup_method()
+    test_suite.setup_class()
     
-    tests = [
-        test_suite.test_master_context_generator(),
-        test_suite.test_reading_content_generator(),
-        test_suite.test_visual_demo_generator(),
-        test_suite.test_audio_content_generator(),
-        test_suite.test_practice_problems_generator()
-    ]
+    # Share one Gemini client (and its connection pool) across all generators
+    test_suite.share_client = True
     
-    try:
-        await asyncio.gather(*tests)
-        print("\n🎉 All individual generator tests passed!")
-        print("✅ Generators are working correctly in isolation")
-        print("✅ Ready to test full pipeline integration")
-        
-    except Exception as e:
-        print(f"\n❌ Generator tests failed: {e}")
-        print("🔧 Fix issues before proceeding to integration tests")
-        raise
-
-def check_environment():
-    """Check that environment is properly configured"""
-    print("\n🔧 Environment Check")
-    print("-" * 30)
-    
-    # Check for API key
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        print("❌ GEMINI_API_KEY not found in environment")
-        print("💡 Please create a .env file with:")
-        print("   GEMINI_API_KEY=your-api-key-here")
-        return False
-    
-    print(f"✅ GEMINI_API_KEY found: {api_key[:8]}...")
-    
-    # Check Python path
-    current_dir = Path(__file__).parent
-    app_dir = current_dir / "app"
+    checks = [
+        ("MasterContextGenerator", test_suite._call_master_context_api, test_suite._assert_master_context_shape),
+        ("ReadingContentGenerator", test_suite._call_reading_content_api, test_suite._assert_reading_content_shape),
+        ("VisualDemoGenerator", test_suite._call_visual_demo_api, test_suite._assert_visual_demo_shape),
+        ("AudioContentGenerator", test_suite._call_audio_content_api, test_suite._assert_audio_content_shape),
+        ("PracticeProblemsGenerator", test_suite._call_practice_problems_api, test_suite._assert_practice_problems_shape)
+    ]
     
-    if not app_dir.exists():
-        print(f"❌ App directory not found: {app_dir}")
-        print("💡 Make sure you're running from the correct directory")
-        return False
+    # Run the API calls concurrently, letting every call finish so one failure
+    # doesn't cancel the others, then check the results one at a time
+    responses = await asyncio.gather(
+        *(call_api() for _, call_api, _ in checks), return_exceptions=True
+    )
+    failures = []
     
-    print(f"✅ App directory found: {app_dir}")
+    for (name, _, assert_shape), response in zip(checks, responses):
+        print(f"\n🧪 Checking {name}...")
+        
+        if isinstance(response, BaseException):
+            print(f"❌ {name} failed: {response}")
+            failures.append(response)
+            continue
+        
+        try:
+            assert_shape(response)
+        except Exception as e:
+            print(f"❌ {name} failed: {e}")
+            failures.append(e)
     
-    # Test imports
-    try:
-        from app.core.generators import MasterContextGenerator
-        print("✅ Generator imports successful")
-    except ImportError as e:
-        print(f"❌ Import failed: {e}")
-        print("💡 Make sure all generator files are in place")
-        return False
+    if failures:
+        print(f"\n❌ {len(failures)}/{len(checks)} generator tests failed:")
+        for failure in failures:
+            print(f"   - {type(failure).__name__}: {failure}")
+        print("🔧 Fix issues before proceeding to integration tests")
+        raise RuntimeError(f"{len(failures)} generator tests failed") from failures[0]
     
-    return True
+    print("\n🎉 All individual generator tests passed!")
+    print("✅ Generators are working correctly in isolation")
+    print("✅ Ready to test full pipeline integration")
 
 if __name__ == "__main__":
     # Run the tests